@@ -0,0 +1,886 @@
+import os
+import sys
+import json
+import ctypes
+import random
+import argparse
+import functools
+from pathlib import Path
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import llvmlite.ir as ll
+    import llvmlite.binding as llvm
+except ImportError:
+    ll = None
+    llvm = None
+
+MASK64 = 0xFFFFFFFFFFFFFFFF
+
+# Integer node kinds; numbering follows IntraDepNodeValueType in
+# static_analysis/Analyzer/device.proto, with K_UNKNOWN appended.
+(K_ADD, K_AND, K_OR, K_SHL, K_LSHR, K_CONSTANT, K_CALL,
+ K_PHI, K_SELECT, K_ARG, K_COMMON, K_NUM_TYPE, K_UNKNOWN) = range(13)
+
+_KIND_FROM_NAME = {
+        'k_NODE_VALUE_ADD':         K_ADD,
+        'k_NODE_VALUE_AND':         K_AND,
+        'k_NODE_VALUE_OR':          K_OR,
+        'k_NODE_VALUE_SHL':         K_SHL,
+        'k_NODE_VALUE_LSHR':        K_LSHR,
+        'k_NODE_VALUE_CONSTANT':    K_CONSTANT,
+        'k_NODE_VALUE_CALL':        K_CALL,
+        'k_NODE_VALUE_PHI':         K_PHI,
+        'k_NODE_VALUE_SELECT':      K_SELECT,
+        'k_NODE_VALUE_ARG':         K_ARG,
+        'k_NODE_VALUE_COMMON':      K_COMMON,
+        'k_NODE_VALUE_NUM_TYPE':    K_NUM_TYPE,
+        }
+
+# Lookup tables indexed by kind; inner node kinds carry children.
+_IS_INNER = [True] * 5 + [False, False, True, True, True, False, False, False]
+
+_OP_CHARS = ['+', '&', '|', '<<', '>>'] + [None] * 8
+
+_BINOP_EVAL = [
+        lambda left, right: (left + right) & MASK64,
+        lambda left, right: left & right,
+        lambda left, right: left | right,
+        lambda left, right: (left << (right & 0x3F)) & MASK64,
+        lambda left, right: left >> (right & 0x3F),
+        ] + [None] * 8
+
+_CTRL_PREFIX = [None] * 7 + ['phi', 'select', 'arg'] + [None] * 3
+
+# Metrics travel through the walk as a plain 6-tuple
+# (max_depth, total_nodes, constant_nodes, op_nodes, call_nodes,
+# phi_nodes); analyze_regnode_complexity converts to a dict at the API
+# boundary.  _METRIC_SLOT gives the counter a node kind bumps (besides
+# total_nodes) as a tuple index.
+_METRIC_SLOT = [3] * 5 + [2, 4, 5, 5, None, None, 4, None]
+
+def _base_metrics(slot):
+    counters = [1, 1, 0, 0, 0, 0]
+    if slot is not None:
+        counters[slot] = 1
+    return tuple(counters)
+
+_BASE_METRICS = [_base_metrics(slot) for slot in _METRIC_SLOT]
+
+def fold_constants(root):
+    """Collapse binops over two CONSTANT children into one CONSTANT node.
+
+    Partial evaluation at load time: constant subtrees produce the same
+    value on every walk, so folding them once shrinks the tree for all
+    later expression, evaluation and complexity passes.  Runs bottom-up
+    so chains of constant binops collapse completely.  Must run before
+    preprocess_regnode, since it rewrites nodeValueType/children.
+    """
+    stack = [(root, None)]
+    while stack:
+        node, children = stack.pop()
+        if children is None:
+            children = node.get('children') or ()
+            if children:
+                stack.append((node, children))
+                for child in children:
+                    stack.append((child, None))
+            continue
+        binop = _BINOP_EVAL[_KIND_FROM_NAME.get(node.get('nodeValueType'), K_UNKNOWN)]
+        if binop is None or len(children) != 2:
+            continue
+        left, right = children
+        if (left.get('nodeValueType') == 'k_NODE_VALUE_CONSTANT'
+                and right.get('nodeValueType') == 'k_NODE_VALUE_CONSTANT'):
+            value = binop(int(left.get('value', '0')) & MASK64,
+                          int(right.get('value', '0')) & MASK64)
+            node['nodeValueType'] = 'k_NODE_VALUE_CONSTANT'
+            node['value'] = str(value)
+            node.pop('children', None)
+    return root
+
+def preprocess_regnode(root):
+    """Annotate a regNode AST in place for the hot traversals.
+
+    Resolves each node's nodeValueType string to an integer _kind and
+    binds _children directly, so the walk dispatches through
+    list-indexing instead of re-hashing the same strings on every
+    traversal.  Idempotent; runs once per tree after json.load.
+    """
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        node['_kind'] = _KIND_FROM_NAME.get(node.get('nodeValueType'), K_UNKNOWN)
+        children = node.get('children') or ()
+        node['_children'] = children
+        stack.extend(children)
+    return root
+
+def _h_constant(node, want, common_values):
+    expr = value = None
+    if want & EXPR:
+        expr = hex(int(node.get('value', '0')))
+    if want & EVAL:
+        value = int(node.get('value', '0')) & MASK64
+    return expr, value
+
+def _h_common(node, want, common_values):
+    expr = value = None
+    if want & EXPR:
+        expr = f'v{node.get("varCnt", "0")}'
+    if want & EVAL:
+        value = common_values.get(int(node.get('varCnt', '0')), 0)
+    return expr, value
+
+def _h_call(node, want, common_values):
+    expr = value = None
+    if want & EXPR:
+        expr = 'call()'
+    if want & EVAL:
+        value = random.getrandbits(64)
+    return expr, value
+
+def _h_num_type(node, want, common_values):
+    expr = value = None
+    if want & EXPR:
+        expr = 'rand()'
+    if want & EVAL:
+        value = random.getrandbits(64)
+    return expr, value
+
+def _h_unknown(node, want, common_values):
+    if want & EVAL:
+        raise Exception(f'Unknown node type {node.get("nodeValueType")}!')
+    return '?', None
+
+_LEAF_HANDLERS = [_h_unknown] * 13
+_LEAF_HANDLERS[K_CONSTANT] = _h_constant
+_LEAF_HANDLERS[K_COMMON] = _h_common
+_LEAF_HANDLERS[K_CALL] = _h_call
+_LEAF_HANDLERS[K_NUM_TYPE] = _h_num_type
+
+# Bitflags selecting which outputs walk_regnode computes.
+EXPR = 1
+EVAL = 2
+METRICS = 4
+
+def walk_regnode(node, want=EXPR, common_values=None, cache=None):
+    """Fused post-order walk over a regNode AST.
+
+    Computes any combination of the expression string, a sampled value
+    and the complexity metrics in a single traversal, selected by the
+    `want` bitflags; unrequested outputs come back as None.  One walk
+    instead of one per output keeps the dict lookups per node constant
+    no matter how many outputs the caller needs.
+
+    Evaluation mirrors evaluateIntraDepNode() in
+    libvirtfuzz/src/generator.cpp: every node records its result in
+    common_values under its varCnt so that later COMMON nodes can refer
+    back to it.
+
+    The optional cache memoizes rendered sub-expressions by id(node),
+    so shared sub-ASTs are walked once per print_ops invocation.  It is
+    only consulted for expression-only walks, since values and metrics
+    cannot be short-circuited.  The cached form is the inner one (binops
+    always parenthesized); only the outermost expression is unwrapped by
+    regnode_to_expr, depending on indent.
+    """
+    if common_values is None:
+        common_values = {}
+    if cache is None:
+        cache = {}
+    if '_kind' not in node:
+        preprocess_regnode(node)
+    stack = [(node, 0)]
+    results = []
+    while stack:
+        cur, state = stack.pop()
+        kind = cur['_kind']
+        if state == 0:
+            if want == EXPR and id(cur) in cache:
+                results.append((cache[id(cur)], None, None))
+                continue
+            if _IS_INNER[kind]:
+                if want == EVAL and _OP_CHARS[kind] is None:
+                    # Eval-only walk: PHI/SELECT/ARG keep exactly one
+                    # child's value, so pick it up front and skip the
+                    # discarded subtrees entirely.  Expression and
+                    # metrics walks still need every child.
+                    stack.append((cur, 2))
+                    stack.append((random.choice(cur['_children']), 0))
+                    continue
+                stack.append((cur, 1))
+                for child in reversed(cur['_children']):
+                    stack.append((child, 0))
+                continue
+            expr, value = _LEAF_HANDLERS[kind](cur, want, common_values)
+            metrics = None
+            if want & METRICS:
+                metrics = _BASE_METRICS[kind]
+            if want & EVAL:
+                common_values[int(cur.get('varCnt', '0'))] = value
+            if want & EXPR:
+                cache[id(cur)] = expr
+            results.append((expr, value, metrics))
+        elif state == 2:
+            # The chosen child's result doubles as this node's result;
+            # only the varCnt recording remains to be done.
+            common_values[int(cur.get('varCnt', '0'))] = results[-1][1]
+        else:
+            children = cur['_children']
+            child_results = results[len(results) - len(children):]
+            del results[len(results) - len(children):]
+            expr = None
+            value = None
+            metrics = None
+            if want & EXPR:
+                child_exprs = [r[0] for r in child_results]
+                op = _OP_CHARS[kind]
+                if op is not None:
+                    expr = f'({child_exprs[0]} {op} {child_exprs[1]})'
+                else:
+                    expr = f'{_CTRL_PREFIX[kind]}({", ".join(child_exprs)})'
+                cache[id(cur)] = expr
+            if want & EVAL:
+                binop = _BINOP_EVAL[kind]
+                if binop is not None:
+                    value = binop(child_results[0][1], child_results[1][1])
+                else:
+                    value = random.choice([r[1] for r in child_results])
+                common_values[int(cur.get('varCnt', '0'))] = value
+            if want & METRICS:
+                max_depth, total, const, ops_n, calls, phis = _BASE_METRICS[kind]
+                for _, _, child_metrics in child_results:
+                    cd, ct, cc, co, ca, cp = child_metrics
+                    if cd + 1 > max_depth:
+                        max_depth = cd + 1
+                    total += ct
+                    const += cc
+                    ops_n += co
+                    calls += ca
+                    phis += cp
+                metrics = (max_depth, total, const, ops_n, calls, phis)
+            results.append((expr, value, metrics))
+    return results.pop()
+
+def flatten_regnode(root):
+    """Lower a regNode AST to flat post-order arrays (SoA form).
+
+    Children always precede their parent, so the jitted evaluator is a
+    single forward loop over the arrays.  COMMON references are resolved
+    at lowering time to the index of the node they refer back to, which
+    removes the common_values dict from the hot loop; unresolved
+    references get -1 and evaluate to 0, matching evaluate_regnode.
+    """
+    if np is None:
+        raise Exception('numpy is required to flatten regnodes!')
+    if '_kind' not in root:
+        preprocess_regnode(root)
+    kinds = []
+    values = []
+    refs = []
+    child_lo = []
+    child_hi = []
+    child_idx = []
+    last_by_var = {}
+    idx_stack = []
+    stack = [(root, 0)]
+    while stack:
+        node, state = stack.pop()
+        if state == 0:
+            stack.append((node, 1))
+            for child in reversed(node['_children']):
+                stack.append((child, 0))
+            continue
+        children = node['_children']
+        child_indices = idx_stack[len(idx_stack) - len(children):]
+        del idx_stack[len(idx_stack) - len(children):]
+        kind = node['_kind']
+        if kind == K_UNKNOWN:
+            raise Exception(f'Unknown node type {node.get("nodeValueType")}!')
+        lo = len(child_idx)
+        child_idx.extend(child_indices)
+        ref = -1
+        if kind == K_COMMON:
+            ref = last_by_var.get(int(node.get('varCnt', '0')), -1)
+        kinds.append(kind)
+        values.append(int(node.get('value', '0')) & MASK64 if kind == K_CONSTANT else 0)
+        refs.append(ref)
+        child_lo.append(lo)
+        child_hi.append(len(child_idx))
+        last_by_var[int(node.get('varCnt', '0'))] = len(kinds) - 1
+        idx_stack.append(len(kinds) - 1)
+    return (np.asarray(kinds, np.int8), np.asarray(values, np.uint64),
+            np.asarray(refs, np.int32), np.asarray(child_lo, np.int32),
+            np.asarray(child_hi, np.int32), np.asarray(child_idx, np.int32))
+
+if numba is not None:
+    # De Bruijn bit-scan-forward, for iterating set bits of the live
+    # bitmap without a ctz intrinsic.
+    _DEBRUIJN64 = np.uint64(0x03f79d71b4cb0a89)
+    _DEBRUIJN_TBL = np.array([
+             0,  1, 48,  2, 57, 49, 28,  3,
+            61, 58, 50, 42, 38, 29, 17,  4,
+            62, 55, 59, 36, 53, 51, 43, 22,
+            45, 39, 33, 30, 24, 18, 12,  5,
+            63, 47, 56, 27, 60, 41, 37, 16,
+            54, 35, 52, 21, 44, 32, 23, 11,
+            46, 26, 40, 15, 34, 20, 31, 10,
+            25, 14, 19,  9, 13,  8,  7,  6,
+            ], np.int64)
+
+    @numba.njit(cache=True)
+    def _eval_flat(kinds, values, refs, child_lo, child_hi, child_idx, seed):
+        if seed >= 0:
+            np.random.seed(seed)
+        n = kinds.shape[0]
+        # Phase 1: pick PHI/SELECT/ARG branches top-down from the root
+        # and mark the reachable nodes in a bitmap, so unselected
+        # branches are never evaluated.
+        nwords = (n + 63) >> 6
+        live = np.zeros(nwords, np.uint64)
+        choice = np.full(n, -1, np.int32)
+        # Tree edges plus one possible push per COMMON back-reference.
+        stack = np.empty(2 * n, np.int32)
+        stack[0] = n - 1
+        sp = 1
+        while sp > 0:
+            sp -= 1
+            i = stack[sp]
+            if (live[i >> 6] >> np.uint64(i & 63)) & np.uint64(1):
+                continue
+            live[i >> 6] |= np.uint64(1) << np.uint64(i & 63)
+            kind = kinds[i]
+            lo = child_lo[i]
+            hi = child_hi[i]
+            if kind == K_PHI or kind == K_SELECT or kind == K_ARG:
+                j = child_idx[lo + np.random.randint(0, hi - lo)]
+                choice[i] = j
+                stack[sp] = j
+                sp += 1
+            else:
+                for c in range(lo, hi):
+                    stack[sp] = child_idx[c]
+                    sp += 1
+                if kind == K_COMMON and refs[i] >= 0:
+                    stack[sp] = refs[i]
+                    sp += 1
+        # Phase 2: evaluate only the live nodes, in ascending index
+        # order (children precede parents), iterating set bits per word.
+        res = np.zeros(n, np.uint64)
+        for w in range(nwords):
+            bits = live[w]
+            base = w << 6
+            while bits:
+                low = bits & (np.uint64(0) - bits)
+                i = base + _DEBRUIJN_TBL[(low * _DEBRUIJN64) >> np.uint64(58)]
+                bits ^= low
+                kind = kinds[i]
+                lo = child_lo[i]
+                if kind == K_CONSTANT:
+                    res[i] = values[i]
+                elif kind == K_ADD:
+                    res[i] = res[child_idx[lo]] + res[child_idx[lo + 1]]
+                elif kind == K_AND:
+                    res[i] = res[child_idx[lo]] & res[child_idx[lo + 1]]
+                elif kind == K_OR:
+                    res[i] = res[child_idx[lo]] | res[child_idx[lo + 1]]
+                elif kind == K_SHL:
+                    res[i] = res[child_idx[lo]] << (res[child_idx[lo + 1]] & np.uint64(0x3F))
+                elif kind == K_LSHR:
+                    res[i] = res[child_idx[lo]] >> (res[child_idx[lo + 1]] & np.uint64(0x3F))
+                elif kind == K_COMMON:
+                    if refs[i] >= 0:
+                        res[i] = res[refs[i]]
+                elif kind == K_PHI or kind == K_SELECT or kind == K_ARG:
+                    res[i] = res[choice[i]]
+                else:
+                    res[i] = ((np.uint64(np.random.randint(0, 0x100000000)) << np.uint64(32))
+                              | np.uint64(np.random.randint(0, 0x100000000)))
+        return res[n - 1]
+
+def evaluate_regnode_flat(flat, seed=-1):
+    """Evaluate a flattened regNode with the numba-jitted kernel.
+
+    Meant for workloads that evaluate the same AST many times (fuzzing
+    loops): the one-time flatten and compile cost amortizes after a few
+    runs.  Callers without numba should keep using evaluate_regnode.
+    """
+    if numba is None:
+        raise Exception('numba is not available, use evaluate_regnode!')
+    return int(_eval_flat(*flat, seed))
+
+def flatten_levels(flat):
+    """Group a flattened regNode into dependency levels.
+
+    Level r holds every node whose operands were all produced at levels
+    below r, so all nodes within a level are independent and can be
+    evaluated as one vectorized batch.  COMMON back-references count as
+    a dependency edge like a child.  Computed once per AST and reused
+    across evaluations.
+    """
+    if np is None:
+        raise Exception('numpy is required to flatten regnodes!')
+    kinds, values, refs, child_lo, child_hi, child_idx = flat
+    n = len(kinds)
+    rank = np.zeros(n, np.int32)
+    for i in range(n):
+        lo = child_lo[i]
+        hi = child_hi[i]
+        if hi > lo:
+            rank[i] = rank[child_idx[lo:hi]].max() + 1
+        elif refs[i] >= 0:
+            rank[i] = rank[refs[i]] + 1
+    order = np.argsort(rank, kind='stable').astype(np.int32)
+    bounds = np.searchsorted(rank[order], np.arange(1, rank[order[-1]] + 1))
+    return np.split(order, bounds)
+
+def evaluate_regnode_vec(flat, levels=None, rng=None):
+    """Evaluate a flattened regNode with NumPy ufuncs, level by level.
+
+    Instead of dispatching per node in Python, each dependency level is
+    split by kind and handled as one array operation: binops gather both
+    operand columns with fancy indexing and run a single masked-shift /
+    add / and / or ufunc over the whole batch (shift amounts masked with
+    & 63, like evaluate_regnode).  Random draws come from a numpy
+    Generator, so the stream is independent of the module random state.
+
+    Unlike the interpreter and the numba kernel, every branch of a
+    PHI/SELECT/ARG is computed before one is kept -- data-parallel
+    evaluation trades that redundancy for wide lanes, which wins on
+    broad, shallow ASTs.
+    """
+    if np is None:
+        raise Exception('numpy is required to flatten regnodes!')
+    kinds, values, refs, child_lo, child_hi, child_idx = flat
+    if levels is None:
+        levels = flatten_levels(flat)
+    if rng is None:
+        rng = np.random.default_rng()
+    res = values.copy()
+    mask63 = np.uint64(0x3F)
+    for idx in levels:
+        lvl_kinds = kinds[idx]
+        for kind, op in ((K_ADD, np.add), (K_AND, np.bitwise_and),
+                         (K_OR, np.bitwise_or), (K_SHL, np.left_shift),
+                         (K_LSHR, np.right_shift)):
+            sel = idx[lvl_kinds == kind]
+            if sel.size == 0:
+                continue
+            lhs = res[child_idx[child_lo[sel]]]
+            rhs = res[child_idx[child_lo[sel] + 1]]
+            if kind == K_SHL or kind == K_LSHR:
+                rhs &= mask63
+            res[sel] = op(lhs, rhs)
+        sel = idx[lvl_kinds == K_COMMON]
+        if sel.size:
+            sel = sel[refs[sel] >= 0]
+            res[sel] = res[refs[sel]]
+        sel = idx[(lvl_kinds == K_CALL) | (lvl_kinds == K_NUM_TYPE)]
+        if sel.size:
+            res[sel] = rng.integers(0, 1 << 64, sel.size, dtype=np.uint64)
+        sel = idx[(lvl_kinds == K_PHI) | (lvl_kinds == K_SELECT)
+                  | (lvl_kinds == K_ARG)]
+        if sel.size:
+            span = (child_hi[sel] - child_lo[sel]).astype(np.int64)
+            pick = child_lo[sel] + rng.integers(0, span)
+            res[sel] = res[child_idx[pick]]
+    return int(res[-1])
+
+_jit_engine = None
+_jit_target_machine = None
+_jit_cache = {}
+_jit_counter = 0
+
+def _regnode_key(root):
+    """Structural key of a regNode AST, for the JIT compile cache.
+
+    Returns the node tuple itself rather than its hash, so cache hits
+    go through full equality and a hash collision between different
+    shapes cannot hand back the wrong compiled function.
+    """
+    parts = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        children = node['_children']
+        parts.append((node['_kind'], node.get('value', ''),
+                      node.get('varCnt', ''), len(children)))
+        stack.extend(children)
+    return tuple(parts)
+
+def _get_jit_engine():
+    global _jit_engine, _jit_target_machine
+    if _jit_engine is None:
+        if not hasattr(llvm, 'create_pass_builder'):
+            # Pre-0.45 llvmlite needs explicit initialization; newer
+            # releases do it automatically and raise if called.
+            llvm.initialize()
+            llvm.initialize_native_target()
+            llvm.initialize_native_asmprinter()
+        target = llvm.Target.from_default_triple()
+        _jit_target_machine = target.create_target_machine()
+        backing = llvm.parse_assembly('')
+        _jit_engine = llvm.create_mcjit_compiler(backing, _jit_target_machine)
+    return _jit_engine
+
+def _optimize_module(llmod):
+    """Run the O2 module pipeline, on whichever pass manager llvmlite has.
+
+    llvmlite 0.45 removed the legacy pass managers in favor of the pass
+    builder API, so pick by feature test rather than version.
+    """
+    if hasattr(llvm, 'create_pass_builder'):
+        pto = llvm.create_pipeline_tuning_options(speed_level=2)
+        pb = llvm.create_pass_builder(_jit_target_machine, pto)
+        pm = pb.getModulePassManager()
+        pm.run(llmod, pb)
+    else:
+        pmb = llvm.create_pass_manager_builder()
+        pmb.opt_level = 2
+        pm = llvm.ModulePassManager()
+        pmb.populate(pm)
+        pm.run(llmod)
+
+def compile_regnode(root):
+    """JIT-compile a regNode AST to native code via llvmlite.
+
+    Emits a uint64 eval(uint64 *rand_pool) whose body is the whole
+    expression in straight-line SSA form: binops map to add/and/or/
+    shl/lshr (shift amounts masked to 63 like evaluate_regnode),
+    CALL/NUM_TYPE load the next word from rand_pool, and PHI/SELECT/ARG
+    draw a word to pick a child through a cmp+select chain.  Compiled
+    functions are cached by structural key, so the one-time compile
+    cost amortizes across repeated evaluations of the same shape.
+
+    Returns a callable taking a sequence of random uint64 words; its
+    rand_count attribute says how many the AST consumes per run.
+    """
+    global _jit_counter
+    if llvm is None:
+        raise Exception('llvmlite is not available, use evaluate_regnode!')
+    if '_kind' not in root:
+        preprocess_regnode(root)
+    key = _regnode_key(root)
+    func = _jit_cache.get(key)
+    if func is not None:
+        return func
+
+    u64 = ll.IntType(64)
+    module = ll.Module(name=f'regnode_{_jit_counter}')
+    fn_name = f'eval_{_jit_counter}'
+    _jit_counter += 1
+    fn = ll.Function(module, ll.FunctionType(u64, [ll.PointerType(u64)]), name=fn_name)
+    builder = ll.IRBuilder(fn.append_basic_block('entry'))
+    rand_pool = fn.args[0]
+    rand_count = 0
+    common = {}
+
+    def take_rand():
+        nonlocal rand_count
+        ptr = builder.gep(rand_pool, [ll.Constant(u64, rand_count)])
+        rand_count += 1
+        return builder.load(ptr)
+
+    stack = [(root, 0)]
+    values = []
+    while stack:
+        cur, state = stack.pop()
+        kind = cur['_kind']
+        if state == 0:
+            if _IS_INNER[kind]:
+                stack.append((cur, 1))
+                for child in reversed(cur['_children']):
+                    stack.append((child, 0))
+                continue
+            if kind == K_CONSTANT:
+                value = ll.Constant(u64, int(cur.get('value', '0')) & MASK64)
+            elif kind == K_COMMON:
+                value = common.get(int(cur.get('varCnt', '0')), ll.Constant(u64, 0))
+            elif kind == K_CALL or kind == K_NUM_TYPE:
+                value = take_rand()
+            else:
+                raise Exception(f'Unknown node type {cur.get("nodeValueType")}!')
+        else:
+            n_children = len(cur['_children'])
+            child_values = values[len(values) - n_children:]
+            del values[len(values) - n_children:]
+            if kind == K_ADD:
+                value = builder.add(child_values[0], child_values[1])
+            elif kind == K_AND:
+                value = builder.and_(child_values[0], child_values[1])
+            elif kind == K_OR:
+                value = builder.or_(child_values[0], child_values[1])
+            elif kind == K_SHL:
+                value = builder.shl(child_values[0],
+                                    builder.and_(child_values[1], ll.Constant(u64, 0x3F)))
+            elif kind == K_LSHR:
+                value = builder.lshr(child_values[0],
+                                     builder.and_(child_values[1], ll.Constant(u64, 0x3F)))
+            else:
+                idx = builder.urem(take_rand(), ll.Constant(u64, len(child_values)))
+                value = child_values[0]
+                for j in range(1, len(child_values)):
+                    value = builder.select(
+                            builder.icmp_unsigned('==', idx, ll.Constant(u64, j)),
+                            child_values[j], value)
+        common[int(cur.get('varCnt', '0'))] = value
+        values.append(value)
+    builder.ret(values.pop())
+
+    engine = _get_jit_engine()
+    llmod = llvm.parse_assembly(str(module))
+    llmod.verify()
+    _optimize_module(llmod)
+    engine.add_module(llmod)
+    engine.finalize_object()
+    cfunc = ctypes.CFUNCTYPE(ctypes.c_uint64, ctypes.POINTER(ctypes.c_uint64))(
+            engine.get_function_address(fn_name))
+
+    def func(rand_words):
+        pool = (ctypes.c_uint64 * max(len(rand_words), 1))(*rand_words)
+        return cfunc(pool)
+    func.rand_count = rand_count
+    _jit_cache[key] = func
+    return func
+
+def evaluate_regnode_jit(node):
+    """Evaluate a regNode through its JIT-compiled form.
+
+    Draws the random words from the module-level random stream, like
+    evaluate_regnode; repeated calls reuse the cached native function.
+    """
+    func = compile_regnode(node)
+    return func([random.getrandbits(64) for _ in range(func.rand_count)])
+
+def regnode_to_expr(node, indent=0, cache=None):
+    """Render a regNode AST as a C-like expression string."""
+    expr, _, _ = walk_regnode(node, EXPR, cache=cache)
+    if indent == 0 and expr.startswith('(') and expr.endswith(')'):
+        expr = expr[1:-1]
+    return expr
+
+def evaluate_regnode(node, common_values):
+    """Sample a concrete value for a regNode AST."""
+    _, value, _ = walk_regnode(node, EVAL, common_values=common_values)
+    return value, common_values
+
+def analyze_regnode_complexity(node):
+    """Collect size/shape metrics for a regNode AST."""
+    _, _, metrics = walk_regnode(node, METRICS)
+    max_depth, total, const, ops_n, calls, phis = metrics
+    return {
+            'max_depth':        max_depth,
+            'total_nodes':      total,
+            'constant_nodes':   const,
+            'op_nodes':         ops_n,
+            'call_nodes':       calls,
+            'phi_nodes':        phis,
+            }
+
+# Op types that map to devilang statements; anything else is skipped.
+_PRINTABLE_OP_TYPES = frozenset({'MMIO', 'PIO', 'IO', 'CONFIG'})
+
+_OP_R_TMPL = ('op op_{oid} {{\n'
+              '    {kind} {name}_{oid} {{\n'
+              '        direction=r;\n'
+              '        region={rid};\n'
+              '        address={addr};\n'
+              '        size={sz};\n'
+              '    }}\n'
+              '}}\n')
+
+_OP_W_TMPL = ('op op_{oid} {{\n'
+              '    {kind} {name}_{oid} {{\n'
+              '        direction=w;\n'
+              '        region={rid};\n'
+              '        address={addr};\n'
+              '        size={sz};\n'
+              '        data={data};\n'
+              '{extra}'
+              '    }}\n'
+              '}}\n')
+
+def print_ops(data, args, out_fp):
+    out = []
+    out.append(f'// ops: {data.get("opNum", 0)}\n')
+    expr_cache = {}
+    for op in data.get('ops', []):
+        op_id = op.get('id')
+        if 'callee' in op:
+            out.append(f'// op_{op_id}: call {op["callee"].get("name")}\n')
+            continue
+        operation = op.get('operation')
+        if operation is None:
+            continue
+        op_type = operation.get('type')
+        if op_type not in _PRINTABLE_OP_TYPES:
+            continue
+        name = operation.get('name')
+        region_id = operation.get('regionId', '0')
+        address = operation.get('reg', ['0'])[0]
+        size = operation.get('size', '4')
+        if operation.get('rw') != 'W':
+            out.append(_OP_R_TMPL.format(oid=op_id, kind=op_type.lower(), name=name,
+                                         rid=region_id, addr=address, sz=size))
+            continue
+        reg_node = operation.get('regNode')
+        if reg_node is not None:
+            want = EXPR
+            if args.evaluate:
+                want |= EVAL
+            if args.complexity:
+                want |= METRICS
+            expr, value, metrics = walk_regnode(reg_node, want, cache=expr_cache)
+            if expr.startswith('(') and expr.endswith(')'):
+                expr = expr[1:-1]
+            extra = ''
+            if args.evaluate:
+                extra += f'        // sample=0x{value:x}\n'
+            if args.complexity:
+                max_depth, total, const, ops_n, calls, phis = metrics
+                extra += (f'        // depth={max_depth} nodes={total} '
+                          f'consts={const} ops={ops_n} '
+                          f'calls={calls} phis={phis}\n')
+        else:
+            expr = 'rand()'
+            extra = ''
+        out.append(_OP_W_TMPL.format(oid=op_id, kind=op_type.lower(), name=name,
+                                     rid=region_id, addr=address, sz=size,
+                                     data=expr, extra=extra))
+        expr_cache.clear()
+    out_fp.write(''.join(out))
+
+def print_bbs(data, out_fp):
+    out = []
+    out.append(f'// bbs: {data.get("bbNum", 0)}\n')
+    bb_dict = data.get('bb', {})
+    for bb_key, op_ids in bb_dict.items():
+        out.append(f'bb {bb_key} {{ {op_ids.strip()} }}\n')
+    out_fp.write(''.join(out))
+
+def print_paths(data, out_fp):
+    out = []
+    out.append(f'// paths: {data.get("pathNum", 0)}\n')
+    funcs = data.get('funcs', {})
+    for func_name, info in funcs.items():
+        for path_id, op_ids in info.get('paths', {}).items():
+            out.append(f'path {func_name}_{path_id} {{ {op_ids.strip()} }}\n')
+    out_fp.write(''.join(out))
+
+def print_funcs(data, out_fp):
+    out = []
+    out.append(f'// funcs: {data.get("funcNum", 0)}\n')
+    funcs = data.get('funcs', {})
+    for func_name in funcs:
+        out.append(f'func {func_name};\n')
+    out_fp.write(''.join(out))
+
+@functools.lru_cache(maxsize=4096)
+def parse_device_name_from_path(config_path):
+    # Cached: each file resolves its device name several times per run
+    # (output path, header, status message).
+    return Path(config_path).stem
+
+def get_config_files_from_folder(folder):
+    entries = [entry.path for entry in os.scandir(folder)
+               if entry.is_file() and entry.name.endswith('.json')
+               and not entry.name.endswith('_dma.json')]
+    entries.sort()
+    return entries
+
+def process_config_file(config_path, args, out_fp):
+    """Render one device model as devilang text into out_fp.
+
+    Each section streams through out_fp with one write per section, so
+    the full rendering is never held in memory and out_fp can be a real
+    file, stdout or any writable object.
+    """
+    device_name = parse_device_name_from_path(config_path)
+    main_data = _loads(Path(config_path).read_bytes())
+    for op in main_data.get('ops', []):
+        operation = op.get('operation')
+        if operation is not None and 'regNode' in operation:
+            fold_constants(operation['regNode'])
+            preprocess_regnode(operation['regNode'])
+    out_fp.write(f'// device: {device_name}\n'
+                 f'device {main_data.get("deviceName", device_name)} {{\n'
+                 f'    regions={main_data.get("regionNum", 0)};\n'
+                 f'    dmas={main_data.get("dmaNum", 0)};\n'
+                 '}\n')
+    if args.ops:
+        print_ops(main_data, args, out_fp)
+    if args.bbs:
+        print_bbs(main_data, out_fp)
+    if args.paths:
+        print_paths(main_data, out_fp)
+    if args.funcs:
+        print_funcs(main_data, out_fp)
+
+def _process_one(config_path, args, output_dir):
+    """Render one config and write its .devilang; runs in a worker process.
+
+    Re-seeds per file so batch output is deterministic for a fixed
+    --seed no matter which worker picks up which file.
+    """
+    if args.seed is not None:
+        random.seed(args.seed)
+    output_path = output_dir / f'{parse_device_name_from_path(config_path)}.devilang'
+    try:
+        with open(output_path, 'w') as output_file:
+            process_config_file(config_path, args, output_file)
+    except json.JSONDecodeError as e:
+        output_path.unlink(missing_ok=True)
+        return f'[-]Skipping {config_path}: {e}'
+    return f'[+]Printed {parse_device_name_from_path(config_path)}.devilang'
+
+def main():
+    parser = argparse.ArgumentParser(description='Print device behavior models (config/dbm) in a readable devilang form.')
+    parser.add_argument('config', type=Path, nargs='?', default=None)
+    parser.add_argument('--config-dir', type=Path, default=None)
+    parser.add_argument('-o', '--output-dir', type=Path, default=None)
+    parser.add_argument('--ops', action='store_true')
+    parser.add_argument('--bbs', action='store_true')
+    parser.add_argument('--paths', action='store_true')
+    parser.add_argument('--funcs', action='store_true')
+    parser.add_argument('--evaluate', action='store_true')
+    parser.add_argument('--complexity', action='store_true')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    if not (args.ops or args.bbs or args.paths or args.funcs):
+        args.ops = True
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    if args.config_dir:
+        config_files = get_config_files_from_folder(args.config_dir)
+        output_dir = args.output_dir if args.output_dir else args.config_dir
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with ProcessPoolExecutor() as executor:
+            for message in executor.map(_process_one, config_files, repeat(args), repeat(output_dir)):
+                print(message)
+    elif args.config:
+        process_config_file(args.config, args, sys.stdout)
+    else:
+        raise Exception('Please input a config file or --config-dir!')
+
+if __name__ == '__main__':
+    main()